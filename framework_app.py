@@ -1,37 +1,41 @@
 from funion_class import Funion
 import funion_parsers as fp
-import pprint as pp
+import asyncio
 
-def main():
-    fun = Funion()
+SPEECHES = [
+    {"url": "https://www.presidency.ucsb.edu/documents/address-before-joint-session-the-congress-4",
+     "filename": "usa_congress.txt", "label": "USA Congress"},
+
+    {"url": "https://presidentofindia.nic.in/speeches/address-honble-president-india-smt-droupadi-murmu-parliament-1",
+     "filename": "india_president.txt", "label": "India President"},
 
-    # Scrape and save speech transcripts
-    fun.load_text("https://www.presidency.ucsb.edu/documents/address-before-joint-session-the-congress-4",
-                  "usa_congress.txt", label="USA Congress")
+    {"url": "https://www.scoop.co.nz/stories/PA2501/S00058/pms-speech-state-of-the-nation-2025.htm",
+     "filename": "new_zealand_speech.txt", "label": "New Zealand PM"},
 
-    fun.load_text("https://presidentofindia.nic.in/speeches/address-honble-president-india-smt-droupadi-murmu-parliament-1",
-                  "india_president.txt", label="India President")
+    {"url": "https://www.stateofthenation.gov.za/assets/downloads/SONA_2025_Speech.pdf",
+     "filename": "south_africa_sona_2025.txt", "label": "South Africa SONA", "parser": fp.extract_text_from_pdf},
 
-    fun.load_text("https://www.scoop.co.nz/stories/PA2501/S00058/pms-speech-state-of-the-nation-2025.htm",
-                  "new_zealand_speech.txt", label="New Zealand PM")
+    {"url": "https://www.fiannafail.ie/news/speech-by-taoiseach-micheál-martin-on-the-announcement-of-members-of-government",
+     "filename": "ireland_taoiseach.txt", "label": "Ireland Taoiseach"},
 
-    fun.load_text("https://www.stateofthenation.gov.za/assets/downloads/SONA_2025_Speech.pdf",
-                  "south_africa_sona_2025.txt", label="South Africa SONA", parser=fp.extract_text_from_pdf)
+    {"url": "https://opm.gov.bs/prime-minister-davis-national-address-building-more-affordable-bahamas/",
+     "filename": "bahamas_national_address.txt", "label": "Bahamas National Address"},
 
-    fun.load_text("https://www.fiannafail.ie/news/speech-by-taoiseach-micheál-martin-on-the-announcement-of-members-of-government",
-                  "ireland_taoiseach.txt", label="Ireland Taoiseach")
+    {"url": "https://lims.leg.bc.ca/pdms/file/ldp/43rd1st/43rd1st-throne-speech.pdf",
+     "filename": "canada_bc.txt", "label": "Canada BC Throne Speech", "parser": fp.extract_text_from_pdf},
 
-    fun.load_text("https://opm.gov.bs/prime-minister-davis-national-address-building-more-affordable-bahamas/",
-                  "bahamas_national_address.txt", label="Bahamas National Address")
+    {"url": "https://www.gov.uk/government/speeches/the-kings-speech-2024",
+     "filename": "uk_kings_speech.txt", "label": "UK King's Speech", "parser": fp.scrape_uk},
+]
 
-    fun.load_text("https://lims.leg.bc.ca/pdms/file/ldp/43rd1st/43rd1st-throne-speech.pdf",
-                  "canada_bc.txt", label="Canada BC Throne Speech", parser=fp.extract_text_from_pdf)
+def main():
+    fun = Funion()
 
-    fun.load_text("https://www.gov.uk/government/speeches/the-kings-speech-2024",
-                  "uk_kings_speech.txt", label="UK King's Speech", parser=fp.scrape_uk)
+    # Scrape and save all speech transcripts concurrently
+    asyncio.run(fun.load_texts_async(SPEECHES))
 
-    # printing data dictionary
-    pp.pprint(fun.data)
+    # dump the data dictionary to JSON
+    fun.save_data()
 
     # First viz
     fun.create_word_sankey()
@@ -6,18 +6,123 @@ for scraping and saving speech transcripts from various sources.
 """
 
 import os
+import asyncio
+import heapq
+import json
+import pickle
+from operator import itemgetter
+from concurrent.futures import ProcessPoolExecutor
+import httpx
 import requests
+from requests.adapters import HTTPAdapter
 from collections import defaultdict, Counter
-from bs4 import BeautifulSoup
+from lxml import etree, html as lxml_html
+import re
 import string
 import nltk
-from textblob import TextBlob
+from nltk.sentiment import SentimentIntensityAnalyzer
 import matplotlib.pyplot as plt
 import seaborn as sns
 import numpy as np
 import plotly.graph_objects as go
 import matplotlib
-matplotlib.use('TkAgg')
+# all matplotlib output goes straight to PNG files, so render with the
+# non-interactive Agg backend instead of spinning up Tk windows
+matplotlib.use('Agg')
+
+# orjson serializes large dicts far faster than the stdlib; fall back
+# to json if it isn't installed
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# fetch the stopword corpus once per process instead of on every Funion()
+try:
+    from nltk.corpus import stopwords
+    stopwords.words('english')
+except LookupError:
+    nltk.download('stopwords', quiet=True)
+    from nltk.corpus import stopwords
+
+_DEFAULT_STOPWORDS = frozenset(stopwords.words('english'))
+
+# VADER lexicon gets the same once-per-process treatment
+try:
+    nltk.data.find('sentiment/vader_lexicon.zip')
+except LookupError:
+    nltk.download('vader_lexicon', quiet=True)
+
+_SENTIMENT_ANALYZER = SentimentIntensityAnalyzer()
+
+# translation table for stripping punctuation, built once
+_PUNCT_TABLE = str.maketrans('', '', string.punctuation)
+
+# deepest top-k ranking precomputed per document at load time; the
+# visualizations ask for at most 20
+_TOP_WORDS_MAX = 50
+
+
+def _parse_paragraphs(html):
+    """ Extract paragraph text from HTML with a direct lxml XPath """
+    doc = lxml_html.fromstring(html)
+    return ' '.join(p.text_content().strip() for p in doc.xpath('//p'))
+
+
+def _parse_paragraphs_stream(chunks):
+    """ Feed response chunks into lxml incrementally so the raw body
+    never has to sit in memory as one big bytes object """
+    parser = etree.HTMLParser()
+    for chunk in chunks:
+        parser.feed(chunk)
+    try:
+        root = parser.close()
+    except etree.XMLSyntaxError:
+        # nothing was fed at all (zero-length body)
+        return ''
+    if root is None:
+        return ''
+    return ' '.join(''.join(p.itertext()).strip() for p in root.iter('p'))
+
+
+def _clean_and_count(text, excluded):
+    """ Lowercase, strip punctuation, drop excluded words, and gather
+    word stats in a single pass over the tokens """
+    wordcount = Counter()
+    total_chars = 0
+    words = []
+
+    for word in text.split():
+        word = word.lower().translate(_PUNCT_TABLE)
+        if word in excluded:
+            continue
+        words.append(word)
+        wordcount[word] += 1
+        total_chars += len(word)
+
+    numwords = len(words)
+    avg_word_length = total_chars / numwords if numwords else 0
+    return ' '.join(words), wordcount, numwords, avg_word_length
+
+
+def _analyze_sentiment(text):
+    """ Sentiment polarity of the text using VADER's compound score """
+    return _SENTIMENT_ANALYZER.polarity_scores(text)['compound']
+
+
+def _score_transcript(transcript, excluded):
+    """ Clean an already-parsed transcript and score it """
+    transcript, wordcount, numwords, avg_word_length = _clean_and_count(transcript, excluded)
+    sentiment = _analyze_sentiment(transcript)
+    return transcript, wordcount, numwords, avg_word_length, sentiment
+
+
+def _process_document(content, parser, excluded):
+    """ CPU-bound half of the pipeline: parse, clean, and score one
+    document. Module-level (and argument-only) so it can run in a
+    worker process. """
+    transcript = parser(content) if parser else _parse_paragraphs(content)
+    return _score_transcript(transcript, excluded)
 
 class Funion:
     def __init__(self, output_folder="speech_transcripts", stopword_file=None):
@@ -25,7 +130,31 @@ class Funion:
         self.output_folder = output_folder
         os.makedirs(self.output_folder, exist_ok=True)
         self.data = defaultdict(dict)
-        self.stop_words = self.load_stop_words(stopword_file)
+        self._sankey_cache = {}
+
+        # stats pickled by a previous run; lets reruns skip the whole
+        # fetch/parse pipeline for documents already processed
+        self.cache_file = os.path.join(self.output_folder, "funion_cache.pkl")
+        self._cache = {}
+        if os.path.exists(self.cache_file):
+            with open(self.cache_file, "rb") as f:
+                self._cache = pickle.load(f)
+        self.stop_words = frozenset(self.load_stop_words(stopword_file))
+        # everything dropped during cleanup, merged into one set so the
+        # per-word filter is a single membership test
+        self._excluded = self.stop_words | {'applause', '–', '—', ''}
+        # compiled alternation over the same exclusions: one C-level
+        # scan of the text, longest tokens first so prefixes don't win
+        alternation = '|'.join(sorted((re.escape(w) for w in self._excluded if w),
+                                      key=len, reverse=True))
+        self._stop_re = re.compile(r'(?:^|(?<=\s))(?:' + alternation + r')(?=\s|$)')
+
+        # one session for all fetches so keep-alive connections get reused
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=16, pool_maxsize=16)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.session.headers.update({"User-Agent": "Mozilla/5.0 (Funion speech scraper)"})
 
     def save_transcript(self, text, filename):
         """ Save the scraped text to a file """
@@ -33,9 +162,8 @@ class Funion:
             f.write(text)
 
     def simple_text_parser(self, html):
-        """ Parse HTML and extract simple text """
-        soup = BeautifulSoup(html, 'html.parser')
-        return ' '.join([p.get_text(strip=True) for p in soup.find_all('p')])
+        """ Parse HTML and extract paragraph text with a direct lxml XPath """
+        return _parse_paragraphs(html)
 
     def to_lowercase(self, text):
         """ Convert all text to lowercase """
@@ -43,13 +171,11 @@ class Funion:
 
     def remove_punctuation(self, text):
         """ Remove all punctuation from the text, excluding hyphens in compound words """
-        return text.translate(str.maketrans('', '', string.punctuation))
+        return text.translate(_PUNCT_TABLE)
 
     def load_stop_words(self, stopword_file):
         """ Load stop words from a file """
-        from nltk.corpus import stopwords
-        nltk.download('stopwords')
-        stop_words = set(stopwords.words('english'))
+        stop_words = set(_DEFAULT_STOPWORDS)
 
         if stopword_file:
             with open(stopword_file, "r", encoding="utf-8") as f:
@@ -58,67 +184,144 @@ class Funion:
         return stop_words
 
     def remove_stop_words(self, text):
-        """ Remove stop words from the text """
-        words = text.split()
-        return ' '.join([word for word in words if word.lower() not in self.stop_words
-                         and word.lower() != 'applause'
-                         and word.lower() != '–'
-                         and word.lower() != '—'])
+        """ Remove stop words from the text (assumes lowercased input) """
+        return ' '.join(self._stop_re.sub('', text).split())
 
     def count_words(self, text):
-        """ Return word count and frequency count (using Counter) """
-        words = text.split()
+        """ Return word count and frequency count (using Counter).
+        Accepts raw text or an already-split word list, so callers
+        computing several stats only need to tokenize once. """
+        words = text.split() if isinstance(text, str) else text
         wordcount = Counter(words)
         numwords = len(words)
         return {"wordcount": wordcount, "numwords": numwords}
 
     def calculate_word_length(self, text):
-        """ Calculate average word length in the text """
-        words = text.split()
+        """ Calculate average word length; accepts raw text or an
+        already-split word list like count_words """
+        words = text.split() if isinstance(text, str) else text
         total_chars = sum(len(word) for word in words)
         average_word_length = total_chars / len(words) if words else 0
         return average_word_length
 
     def analyze_sentiment(self, text):
-        """ Analyze sentiment of the text using TextBlob """
-        blob = TextBlob(text)
-        return blob.sentiment.polarity
+        """ Analyze sentiment of the text using VADER """
+        return _analyze_sentiment(text)
 
     def load_text(self, url, filename, label=None, parser=None):
-        """ Fetch and save speech transcript from a URL """
-        r = requests.get(url)
-        r.raise_for_status()
-
-        if parser:
-            transcript = parser(r.content)
+        """ Fetch and save speech transcript from a URL. With the
+        default parser the body is streamed straight into lxml in
+        64 KiB chunks instead of buffered whole; custom parsers (PDF,
+        site-specific scrapers) still need the full body. """
+        if self._load_cached(filename, label):
+            return
+        with self.session.get(url, timeout=30, stream=True) as r:
+            r.raise_for_status()
+            if parser:
+                result = _process_document(r.content, parser, self._excluded)
+            else:
+                transcript = _parse_paragraphs_stream(r.iter_content(64 * 1024))
+                result = _score_transcript(transcript, self._excluded)
+        self._record_result(result, filename, label)
+
+    async def load_texts_async(self, specs):
+        """ Fetch all speeches concurrently, then parse/clean each one
+        in a worker-process pool so the documents also get cleaned in
+        parallel across CPUs. Each spec is a dict with the same keys as
+        load_text's arguments: url, filename, and optional label/parser. """
+        loop = asyncio.get_running_loop()
+        limits = httpx.Limits(max_connections=16)
+        with ProcessPoolExecutor() as pool:
+            async with httpx.AsyncClient(limits=limits, timeout=30,
+                                         follow_redirects=True,
+                                         headers=dict(self.session.headers)) as client:
+                async def fetch_and_process(spec):
+                    if self._load_cached(spec['filename'], spec.get('label')):
+                        return
+                    r = await client.get(spec['url'])
+                    r.raise_for_status()
+                    result = await loop.run_in_executor(
+                        pool, _process_document, r.content,
+                        spec.get('parser'), self._excluded)
+                    self._record_result(result, spec['filename'], spec.get('label'))
+
+                await asyncio.gather(*(fetch_and_process(spec) for spec in specs))
+        self.save_cache()
+
+    def clean_and_count(self, text):
+        """ Lowercase, strip punctuation, drop stop words, and gather
+        word stats in a single pass over the tokens """
+        return _clean_and_count(text, self._excluded)
+
+    def process_text(self, content, filename, label=None, parser=None):
+        """ Parse raw page content, clean it, and record stats """
+        result = _process_document(content, parser, self._excluded)
+        self._record_result(result, filename, label)
+
+    def _load_cached(self, filename, label):
+        """ Pull a document's stats from the pickle cache if present """
+        key = label or filename
+        if key in self._cache:
+            self.data[key] = self._cache[key]
+            self._sankey_cache.clear()
+            return True
+        return False
+
+    def save_cache(self):
+        """ Pickle the collected stats so the next run can skip
+        fetching and reprocessing """
+        with open(self.cache_file, "wb") as f:
+            pickle.dump(dict(self.data), f, protocol=pickle.HIGHEST_PROTOCOL)
+
+    def save_data(self, path="funion_data.json"):
+        """ Serialize the collected stats to JSON (orjson when available) """
+        serializable = {
+            doc: {**stats, 'word_count': dict(stats['word_count'])}
+            for doc, stats in self.data.items()
+        }
+        if orjson is not None:
+            with open(path, 'wb') as f:
+                f.write(orjson.dumps(serializable, option=orjson.OPT_INDENT_2))
         else:
-            transcript = self.simple_text_parser(r.content)
-
-        transcript = self.to_lowercase(transcript)
-        transcript = self.remove_punctuation(transcript)
-        transcript = self.remove_stop_words(transcript)
-
-        stats = self.count_words(transcript)
-        word_count = stats['wordcount']
-        numwords = stats['numwords']
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump(serializable, f, indent=2)
+        return path
 
-        avg_word_length = self.calculate_word_length(transcript)
-        sentiment = self.analyze_sentiment(transcript)
+    def _record_result(self, result, filename, label):
+        """ Store a processed document's stats and save its transcript """
+        transcript, word_count, numwords, avg_word_length, sentiment = result
 
         self.data[label or filename] = {
             'word_count': word_count,
             'num_words': numwords,
             'word_length': avg_word_length,
-            'sentiment': sentiment
+            'sentiment': sentiment,
+            'top_words': word_count.most_common(_TOP_WORDS_MAX)
         }
 
+        # the loaded documents changed, so any built sankey is stale
+        self._sankey_cache.clear()
+
         self.save_transcript(transcript, filename)
 
+    def _top_words(self, doc, k):
+        """ Top-k (word, count) pairs for one document, sliced from the
+        ranking precomputed in _record_result so reprocessing a document
+        naturally refreshes it """
+        stats = self.data[doc]
+        top = stats.get('top_words')
+        if top is not None and k <= _TOP_WORDS_MAX:
+            return top[:k]
+        return stats['word_count'].most_common(k)
+
     def create_word_sankey(self, wordlist=None, k=20):
         """
         create a sankey showing text-to-word relationships
         with n most frequent words per text.
         """
+        cache_key = (tuple(wordlist) if wordlist is not None else None, k)
+        if cache_key in self._sankey_cache:
+            return self._sankey_cache[cache_key]
 
         sources = []
         targets = []
@@ -133,46 +336,40 @@ class Funion:
 
         label_to_index = {label: idx for idx, label in enumerate(labels)}
 
-        # if there's a wordlist
-        if wordlist is None:
-
-            # get common word counts
-            all_word_counts = Counter()
-            for text, stats in self.data.items():
-                all_word_counts.update(stats['word_count'])
-
-            # most common words across all docs
-            global_top_words = [word for word, count in all_word_counts.most_common(k)]
-            labels.extend(global_top_words)
-            label_to_index = {label: idx for idx, label in enumerate(labels)}
-
+        if wordlist is not None:
+            # caller picked the words; nothing needs ranking
+            global_top_words = list(wordlist)
         else:
-            # use top k words across all documents
-            all_word_counts = Counter()
-            for text, stats in self.data.items():
-                all_word_counts.update(stats['word_count'])
-
-            global_top_words = [word for word, count in all_word_counts.most_common(k)]
-
-            # add words to labels
-            for word in global_top_words:
-                if word not in label_to_index:
-                    label_to_index[word] = len(labels)
-                    labels.append(word)
-
-            for text, stats in self.data.items():
-                text_idx = label_to_index[text]
-                word_counts = stats['word_count']
+            # merge per-document frequencies into a plain dict and keep
+            # only the top k with a heap instead of fully sorting a
+            # merged Counter
+            totals = {}
+            for stats in self.data.values():
+                for word, count in stats['word_count'].items():
+                    totals[word] = totals.get(word, 0) + count
+
+            global_top_words = [word for word, count in
+                                heapq.nlargest(k, totals.items(), key=itemgetter(1))]
+
+        # add words to labels
+        for word in global_top_words:
+            if word not in label_to_index:
+                label_to_index[word] = len(labels)
+                labels.append(word)
+
+        for text, stats in self.data.items():
+            text_idx = label_to_index[text]
+            word_counts = stats['word_count']
 
-                # get top words in document that are also global top words
-                top_words = [word for word, count in word_counts.most_common(k)
-                             if word in global_top_words]
+            # get top words in document that are also global top words
+            top_words = [word for word, count in self._top_words(text, k)
+                         if word in global_top_words]
 
-                for word in top_words:
-                    word_idx = label_to_index[word]
-                    sources.append(text_idx)
-                    targets.append(word_idx)
-                    values.append(word_counts[word])
+            for word in top_words:
+                word_idx = label_to_index[word]
+                sources.append(text_idx)
+                targets.append(word_idx)
+                values.append(word_counts[word])
 
         # create sankey diagram
         fig = go.Figure(go.Sankey(
@@ -197,11 +394,12 @@ class Funion:
             height=600
         )
 
+        self._sankey_cache[cache_key] = fig
         return fig
 
     def show_word_sankey(self, wordlist=None, k=20):
-        # display sankey
-        fig = self.create_word_sankey(k)
+        # display sankey (rebuilt only on a cache miss)
+        fig = self.create_word_sankey(wordlist=wordlist, k=k)
         fig.show()
 
     def plot_word_barcharts(self, top_n=5):
@@ -228,22 +426,17 @@ class Funion:
         # subplot each document
         for idx, (doc_name, stats) in enumerate(documents):
             ax = axes[idx]
-            word_counts = stats['word_count']
-            top_words = word_counts.most_common(top_n)
+            top_words = self._top_words(doc_name, top_n)
 
             words = [w[0] for w in top_words]
-            counts = [w[1] for w in top_words]
+            counts = np.fromiter((w[1] for w in top_words), dtype=int,
+                                 count=len(top_words))
 
             bars = ax.barh(words, counts, color='#B22222')
             ax.invert_yaxis()  # Highest count at top
 
-            # add word count labels
-            for bar in bars:
-                width = bar.get_width()
-                ax.text(width + 0.10, bar.get_y() + bar.get_height() / 2,
-                        f'{int(width)}',
-                        ha='left', va='center',
-                        fontsize=9)
+            # add word count labels in one call instead of per-bar text
+            ax.bar_label(bars, counts, padding=3, fontsize=9)
 
             # subplot titles and axes
             ax.set_title(doc_name)
@@ -260,24 +453,22 @@ class Funion:
     def plot_summary(self):
         """Create a scatter plot of word count vs sentiment, with
         point size = avg word length"""
-        countries = []
-        word_counts = []
-        sentiments = []
-        avg_word_lengths = []
-
-        for country, stats in self.data.items():
-            countries.append(country)
-            word_counts.append(stats['num_words'])
-            sentiments.append(stats['sentiment'])
-            avg_word_lengths.append(stats['word_length'])
+        countries = list(self.data.keys())
+        n = len(countries)
+        word_counts = np.fromiter((s['num_words'] for s in self.data.values()),
+                                  dtype=float, count=n)
+        sentiments = np.fromiter((s['sentiment'] for s in self.data.values()),
+                                 dtype=float, count=n)
+        avg_word_lengths = np.fromiter((s['word_length'] for s in self.data.values()),
+                                       dtype=float, count=n)
 
         # Set up the plot
         plt.figure(figsize=(12, 8))
         scatter = plt.scatter(
             word_counts,
             sentiments,
-            s=[length * 80 for length in avg_word_lengths],  # Scale for visibility
-            c=sns.color_palette("hls", len(countries)),
+            s=avg_word_lengths * 80,  # Scale for visibility
+            c=sns.color_palette("hls", n),
             alpha=0.7
         )
 
@@ -1,15 +1,15 @@
 from bs4 import BeautifulSoup
-import PyPDF2
+from pypdf import PdfReader
 from io import BytesIO
 
 def extract_text_from_pdf(pdf_content):
-    """ Extract text from PDF """
+    """ Extract text from PDF, one page at a time """
     with BytesIO(pdf_content) as f:
-        reader = PyPDF2.PdfReader(f)
-        return ''.join(p.extract_text() for p in reader.pages)
+        reader = PdfReader(f)
+        return '\n'.join(page.extract_text() for page in reader.pages)
 
 def scrape_uk(html):
     """ Special scraper for UK speeches """
-    soup = BeautifulSoup(html, 'html.parser')
+    soup = BeautifulSoup(html, 'lxml')
     content = soup.find("div", class_="govspeak") or soup
     return ' '.join(p.get_text(strip=True) for p in content.find_all('p'))